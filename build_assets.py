@@ -0,0 +1,102 @@
+"""화면 표시 크기에 맞춘 이미지 변형본 생성 (빌드 단계에서 실행).
+
+ui_Test1.py ~ ui_Test4.py에서 각 QLabel의 크기와 표시하는 리소스 이미지를 읽어, 그 크기로 줄이고 압축한
+이미지를 resources/display 폴더에 저장한다. main_0616.load_image는 manifest.json을 보고 라벨 크기에 맞는
+변형본을 사용하며, 변형본이 없으면 원본 이미지를 사용한다.
+
+사용 예:
+    python build_assets.py
+    python build_assets.py --webp --scale 2
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+
+from PIL import Image
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESOURCES_DIR = os.path.join(BASE_DIR, 'resources')
+DISPLAY_DIR = os.path.join(RESOURCES_DIR, 'display')
+MANIFEST_FILE = 'manifest.json'
+
+JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+
+_GEOMETRY_RE = re.compile(r"self\.(\w+)\.setGeometry\(QRect\(-?\d+, -?\d+, (\d+), (\d+)\)\)")
+_PIXMAP_RE = re.compile(r"self\.(\w+)\.setPixmap\(QPixmap\(u\":/newPrefix/([^\"]+)\"\)\)")
+
+
+# ui 파일에서 (이미지 파일, 라벨 너비, 라벨 높이) 목록 추출
+def label_sizes(ui_files):
+    sizes = set()
+    for ui_file in ui_files:
+        with open(ui_file, encoding='utf-8') as f:
+            source = f.read()
+        geometry = {name: (int(w), int(h)) for name, w, h in _GEOMETRY_RE.findall(source)}
+        for name, image_file in _PIXMAP_RE.findall(source):
+            if name in geometry:
+                sizes.add((image_file,) + geometry[name])
+    return sorted(sizes)
+
+
+# 변형본 키 (main_0616.display_image_path가 라벨 크기로 찾는 manifest 키와 같은 규칙)
+def variant_key(width, height):
+    return f"{width}x{height}"
+
+
+# 이미지 하나를 라벨 크기로 줄여 저장, 생성한 파일 이름 목록 반환 (선호 순서)
+def build_variant(image_file, width, height, scale=1, webp=False):
+    with Image.open(os.path.join(RESOURCES_DIR, image_file)) as image:
+        # 원본보다 크게 늘리지는 않는다 (라벨이 표시할 때 늘린다)
+        size = (min(image.width, width * scale), min(image.height, height * scale))
+        resized = image.resize(size, Image.LANCZOS) if size != image.size else image.copy()
+
+    stem = os.path.splitext(image_file)[0]
+    base_name = f"{stem}_{variant_key(width, height)}"
+    has_alpha = resized.mode in ('RGBA', 'LA') or (resized.mode == 'P' and 'transparency' in resized.info)
+
+    outputs = []
+    if webp:
+        name = base_name + '.webp'
+        resized.save(os.path.join(DISPLAY_DIR, name), 'WEBP', quality=WEBP_QUALITY, method=6)
+        outputs.append(name)
+
+    if has_alpha:
+        name = base_name + '.png'
+        resized.save(os.path.join(DISPLAY_DIR, name), 'PNG', optimize=True)
+    else:
+        name = base_name + '.jpg'
+        resized.convert('L' if resized.mode == 'L' else 'RGB').save(
+            os.path.join(DISPLAY_DIR, name), 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    outputs.append(name)
+    return outputs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="라벨 크기에 맞춘 표시용 이미지 생성")
+    parser.add_argument("--scale", type=int, default=1, help="고해상도 화면용 배율 (기본값: 1)")
+    parser.add_argument("--webp", action="store_true", help="WebP 변형본도 생성 (Qt WebP 플러그인이 있을 때 우선 사용)")
+    args = parser.parse_args(argv)
+
+    os.makedirs(DISPLAY_DIR, exist_ok=True)
+    ui_files = sorted(glob.glob(os.path.join(BASE_DIR, 'ui_Test*.py')))
+
+    manifest = {}
+    for image_file, width, height in label_sizes(ui_files):
+        outputs = build_variant(image_file, width, height, scale=args.scale, webp=args.webp)
+        manifest.setdefault(image_file, {})[variant_key(width, height)] = outputs
+
+        original_size = os.path.getsize(os.path.join(RESOURCES_DIR, image_file))
+        variant_size = os.path.getsize(os.path.join(DISPLAY_DIR, outputs[-1]))
+        print(f"{image_file} ({width}x{height}): {original_size // 1024} KB -> {variant_size // 1024} KB")
+
+    with open(os.path.join(DISPLAY_DIR, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,14 +2,19 @@ import sys
 import numpy as np
 import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from openpyxl import Workbook
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PyQt5.QtWidgets import (QWidget, QApplication, QVBoxLayout, QFormLayout,
                              QLineEdit, QPushButton, QComboBox, QMessageBox,
-                             QTableWidget, QTableWidgetItem)
+                             QTableView)
 
 matplotlib.use('Qt5Agg')  # Matplotlib 백엔드를 Qt5Agg로 설정
 
+MAX_ALLOWABLE_FORCE = 250  # 허용 가능한 최대 하중 (kN)
+LABEL_MEMBER_LIMIT = 200  # 부재력 라벨은 부재 수가 이 값보다 적을 때만 표시
+
 class BridgeElement:
     def __init__(self, bridge_length_m, support_points_count, material_elasticity_kg_per_mm2, fixed_load_kN,
                  live_load_kN, unit_weight_kg, member_section):
@@ -22,6 +27,69 @@ class BridgeElement:
         self.unit_weight_kg = unit_weight_kg  # 재료의 단위 중량 (kg/m^3)
         self.member_section = member_section  # 부재 단면 (H빔 또는 I빔)
 
+# 트러스 모델 (구조체 배열): 절점 좌표와 부재 연결은 배열로, 재료와 하중 값은 한 번만 저장
+class TrussModel:
+    def __init__(self, nodes, elements, elastic_modulus, dead_load, live_load, unit_weight, cross_section):
+        self.nodes = np.asarray(nodes, dtype=float)  # 절점 좌표 (n_nodes, 2)
+        self.elements = np.asarray(elements, dtype=np.intp)  # 부재 양 끝 절점 번호 (n_members, 2), 0부터 시작
+        self.elastic_modulus = elastic_modulus  # 재료 탄성 계수 (kg/mm^2)
+        self.dead_load = dead_load  # 고정 하중 (kN)
+        self.live_load = live_load  # 활 하중 (kN)
+        self.unit_weight = unit_weight  # 재료의 단위 중량 (kg/m^3)
+        self.cross_section = cross_section  # 부재 단면 (H빔 또는 I빔)
+
+        delta = self.nodes[self.elements[:, 1]] - self.nodes[self.elements[:, 0]]
+        self.lengths = np.hypot(delta[:, 0], delta[:, 1])  # 부재 길이 (m)
+        self.angles = np.degrees(np.arctan2(delta[:, 1], delta[:, 0]))  # 부재 각도 (도)
+
+    def __len__(self):
+        return len(self.elements)
+
+    # 부재 양 끝 좌표 (n_members, 2, 2), 그림 그리기용
+    @property
+    def segments(self):
+        return self.nodes[self.elements]
+
+    # 부재 하나의 양 끝 좌표 ((x1, y1), (x2, y2)), 표와 메시지 표시용
+    def member(self, index):
+        (x1, y1), (x2, y2) = self.nodes[self.elements[index]].tolist()
+        return (x1, y1), (x2, y2)
+
+# 부재 결과 표 모델: NumPy 배열을 그대로 들고 있다가 화면에 보이는 셀만 data()에서 문자열로 만든다
+class MemberTableModel(QAbstractTableModel):
+    HEADERS = ["부재", "길이 (m)", "탄성 계수 (kg/mm^2)", "하중 (kN)", "평가 결과"]
+
+    def __init__(self, truss, forces, failed_mask, parent=None):
+        super().__init__(parent)
+        self.truss = truss
+        self.forces = np.asarray(forces, dtype=float)
+        self.safe = ~np.asarray(failed_mask, dtype=bool)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.truss)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row, column = index.row(), index.column()
+        if column == 0:
+            return f"{self.truss.member(row)}"
+        if column == 1:
+            return f"{self.truss.lengths[row]:.2f}"
+        if column == 2:
+            return f"{self.truss.elastic_modulus:.2f}"
+        if column == 3:
+            return f"{self.forces[row]:.2f}"
+        return "안전" if self.safe[row] else "불안전"
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
 class TrussApp(QWidget):
     def __init__(self):
         super().__init__()
@@ -65,8 +133,8 @@ class TrussApp(QWidget):
         layout.addLayout(form_layout)
         layout.addWidget(self.submit_btn)
 
-        # 테이블 위젯 추가
-        self.table = QTableWidget()
+        # 테이블 뷰 추가 (결과는 show_table에서 MemberTableModel로 연결)
+        self.table = QTableView()
         layout.addWidget(self.table)
 
         self.setLayout(layout)
@@ -96,12 +164,17 @@ class TrussApp(QWidget):
                 member_section=cross_section
             )
 
-            truss_data, member_forces = self.calculate_truss(bridge_element)  # 이 부분 수정
+            truss, member_forces = self.calculate_truss(bridge_element)
 
-            is_safe, failed_members, unstable_parameters = self.check_stability(member_forces, bridge_element)
-            self.create_excel_file(truss_data, member_forces)
-            self.plot_truss(truss_data, member_forces, is_safe)
-            self.show_table(truss_data, is_safe, failed_members, unstable_parameters, member_forces)  # 이 부분 수정
+            is_safe, failed_mask, failed_indices, unstable_parameters = self.check_stability(truss, member_forces,
+                                                                                             bridge_element)
+            # 메시지 표시용 (실패한 부재만 좌표 튜플로 변환)
+            failed_members = [(truss.member(index), force)
+                              for index, force in zip(failed_indices.tolist(), member_forces[failed_indices].tolist())]
+            self.create_excel_file(truss, member_forces)
+            self.create_result_arrays_file(truss, member_forces, bridge_element)
+            self.plot_truss(truss, member_forces, is_safe)
+            self.show_table(truss, is_safe, failed_mask, failed_members, unstable_parameters, member_forces)
 
             if is_safe:
                 QMessageBox.information(self, '결과', '교량이 안전합니다.')
@@ -113,24 +186,10 @@ class TrussApp(QWidget):
             QMessageBox.critical(self, '오류 발생', f'오류가 발생했습니다: {str(e)}')
 
 
-    def show_table(self, truss_data, is_safe, failed_members, unstable_parameters, member_forces):
-        self.table.setRowCount(len(truss_data))
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["부재", "길이 (m)", "탄성 계수 (kg/mm^2)", "하중 (kN)", "평가 결과"])
-
-        for row, data in enumerate(truss_data):
-            member, length, _, elastic_modulus, _, _, _, _ = data
-            force = sum(member_force[1] for member_force in member_forces if member_force[0] == member)
-            item_member = QTableWidgetItem(f"{member}")
-            item_length = QTableWidgetItem(f"{length:.2f}")
-            item_elastic_modulus = QTableWidgetItem(f"{elastic_modulus:.2f}")
-            item_force = QTableWidgetItem(f"{force:.2f}")
-            item_evaluation = QTableWidgetItem("안전" if abs(force) <= 250 else "불안전")
-            self.table.setItem(row, 0, item_member)
-            self.table.setItem(row, 1, item_length)
-            self.table.setItem(row, 2, item_elastic_modulus)
-            self.table.setItem(row, 3, item_force)
-            self.table.setItem(row, 4, item_evaluation)
+    def show_table(self, truss, is_safe, failed_mask, failed_members, unstable_parameters, member_forces):
+        # member_forces는 truss의 부재 순서와 같은 배열이므로 행 번호로 바로 찾음
+        self.table_model = MemberTableModel(truss, member_forces, failed_mask)
+        self.table.setModel(self.table_model)
 
         # 안전하지 않은 부재 및 불안정한 매개 변수 표시
         if not is_safe:
@@ -142,90 +201,91 @@ class TrussApp(QWidget):
     def calculate_truss(self, bridge_element):
         length = bridge_element.bridge_length_m
         num_nodes = bridge_element.support_points_count
-        elastic_modulus = bridge_element.material_elasticity_kg_per_mm2
-        dead_load = bridge_element.fixed_load_kN
-        live_load = bridge_element.live_load_kN
-        unit_weight = bridge_element.unit_weight_kg
-        cross_section = bridge_element.member_section
 
         panel_length = length / (num_nodes - 1)
-        nodes = []
-
-        for i in range(num_nodes):
-            x = i * panel_length
-            y = 0 if i % 2 == 0 else panel_length
-            nodes.append((x, y))
-
-        members = []
-        for i in range(num_nodes - 1):
-            members.append((nodes[i], nodes[i + 1]))
-            if i < num_nodes - 2:
-                members.append((nodes[i], nodes[i + 2]))
-
-        truss_data = []
-        for member in members:
-            x1, y1 = member[0]
-            x2, y2 = member[1]
-            length = np.sqrt((x2 - x1)**2 + (y2 - y1)**2)
-            angle = np.degrees(np.arctan2((y2 - y1), (x2 - x1)))
-            truss_data.append([member, length, angle, elastic_modulus, dead_load, live_load, unit_weight, cross_section])
-
-        member_forces = self.analyze_forces(truss_data)
-
-        return truss_data, member_forces
-
-    def analyze_forces(self, truss_data):
-        member_forces = []
-        for data in truss_data:
-            member, length, angle, elastic_modulus, dead_load, live_load, unit_weight, cross_section = data
-            force = (dead_load + live_load) * length * 9.81 * unit_weight * 1e-3  # force 변환
-            member_forces.append([member, force])
-        return member_forces
-
-    def check_stability(self, member_forces, bridge_element):
-        max_allowable_force = 250  # 허용 가능한 최대 하중
-        failed_members = []
-        unstable_parameters = []
-
-        for member, force in member_forces:
-            if abs(force) > max_allowable_force:
-                failed_members.append((member, force))
-                # 안전하지 않은 부재의 길이를 기준으로 안정성을 향상시킬 수 있는 변수를 찾음
-                length = np.sqrt((member[1][0] - member[0][0]) ** 2 + (member[1][1] - member[0][1]) ** 2)
-                if length > bridge_element.bridge_length_m / 2:
-                    unstable_parameters.append("교량 길이를 늘리십시오.")
-                else:
-                    unstable_parameters.append("부재 단면적을 증가시키십시오.")
-
-        return len(failed_members) == 0, failed_members, unstable_parameters
-
-    def create_excel_file(self, truss_data, member_forces):
+        index = np.arange(num_nodes)
+        nodes = np.column_stack([index * panel_length, np.where(index % 2 == 0, 0.0, panel_length)])
+
+        # 부재 순서: 절점 i마다 (i, i+1) 다음 (i, i+2)
+        elements = np.empty((max(2 * num_nodes - 3, 0), 2), dtype=np.intp)
+        elements[0::2] = np.column_stack([index[:-1], index[1:]])
+        elements[1::2] = np.column_stack([index[:-2], index[2:]])
+
+        truss = TrussModel(nodes, elements,
+                           elastic_modulus=bridge_element.material_elasticity_kg_per_mm2,
+                           dead_load=bridge_element.fixed_load_kN,
+                           live_load=bridge_element.live_load_kN,
+                           unit_weight=bridge_element.unit_weight_kg,
+                           cross_section=bridge_element.member_section)
+
+        member_forces = self.analyze_forces(truss)
+
+        return truss, member_forces
+
+    def analyze_forces(self, truss):
+        # 부재 순서대로 정렬된 부재력 배열 (kN)
+        return (truss.dead_load + truss.live_load) * truss.lengths * 9.81 * truss.unit_weight * 1e-3  # force 변환
+
+    # 반환값: 안전 여부, 실패 부재 마스크 (n_members,), 실패 부재 번호 배열, 실패 부재별 개선 방안 목록
+    def check_stability(self, truss, member_forces, bridge_element):
+        failed_mask = np.abs(member_forces) > MAX_ALLOWABLE_FORCE
+        failed_indices = np.flatnonzero(failed_mask)
+
+        # 안전하지 않은 부재의 길이를 기준으로 안정성을 향상시킬 수 있는 변수를 찾음
+        too_long = truss.lengths[failed_indices] > bridge_element.bridge_length_m / 2
+        unstable_parameters = np.where(too_long, "교량 길이를 늘리십시오.", "부재 단면적을 증가시키십시오.").tolist()
+
+        return not failed_mask.any(), failed_mask, failed_indices, unstable_parameters
+
+    def create_excel_file(self, truss, member_forces):
         wb = Workbook()
         ws = wb.active
         ws.title = "Truss Data"
 
         ws.append(["부재", "길이 (m)", "각도 (도)", "탄성 계수 (kg/mm^2)", "고정 하중 (kN)", "활 하중 (kN)", "단위 중량 (kg/m^3)", "부재 단면",
                    "부재력 (kN)"])
-        for data, force_data in zip(truss_data, member_forces):
-            member, length, angle, elastic_modulus, dead_load, live_load, unit_weight, cross_section = data
-            force = force_data[1]
-            ws.append(
-                [f"{member}", length, angle, elastic_modulus, dead_load, live_load, unit_weight, cross_section, force])
+        for index, (length, angle, force) in enumerate(zip(truss.lengths.tolist(), truss.angles.tolist(),
+                                                            member_forces.tolist())):
+            ws.append([f"{truss.member(index)}", length, angle, truss.elastic_modulus, truss.dead_load,
+                       truss.live_load, truss.unit_weight, truss.cross_section, force])
 
         filename = "truss_structure.xlsx"
         wb.save(filename)
         return filename
 
-    def plot_truss(self, truss_data, member_forces, is_safe):
+    # 엑셀 파일과 함께 열 형식 배열 파일로도 저장 (압축하지 않으므로 np.load나 메모리 매핑으로 바로 읽을 수 있음)
+    def create_result_arrays_file(self, truss, member_forces, bridge_element):
+        filename = "truss_structure.npz"
+        np.savez(filename,
+                 nodes=truss.nodes,
+                 elements=truss.elements,
+                 lengths=truss.lengths,
+                 angles=truss.angles,
+                 member_forces=member_forces,
+                 bridge_length_m=bridge_element.bridge_length_m,
+                 support_points_count=bridge_element.support_points_count,
+                 elastic_modulus=truss.elastic_modulus,
+                 dead_load=truss.dead_load,
+                 live_load=truss.live_load,
+                 unit_weight=truss.unit_weight,
+                 cross_section=truss.cross_section)
+        return filename
+
+    def plot_truss(self, truss, member_forces, is_safe):
         self.figure.clear()
         self.ax = self.figure.add_subplot(111)
 
-        for data, force_data in zip(truss_data, member_forces):
-            member, length, angle, elastic_modulus, dead_load, live_load, unit_weight, cross_section = data
-            (x1, y1), (x2, y2) = member
-            color = "green" if is_safe else "red"
-            self.ax.plot([x1, x2], [y1, y2], color=color, linewidth=2)
-            self.ax.text((x1 + x2) / 2, (y1 + y2) / 2, f"{force_data[1]:.2f} kN", color="blue", fontsize=8, ha='center')
+        # 모든 부재를 LineCollection 하나로 그림
+        segments = truss.segments
+        color = "green" if is_safe else "red"
+        self.ax.add_collection(LineCollection(segments, colors=color, linewidths=2))
+        self.ax.autoscale_view()
+
+        # 부재가 많으면 라벨이 겹쳐 읽을 수 없고 Text 객체 생성 비용만 커지므로 생략 (부재력은 표에서 확인)
+        if len(truss) < LABEL_MEMBER_LIMIT:
+            midpoints = segments.mean(axis=1)
+            for (x, y), force in zip(midpoints.tolist(), member_forces.tolist()):
+                self.ax.text(x, y, f"{force:.2f} kN", color="blue", fontsize=8, ha='center')
 
         self.ax.axis('off')
         self.ax.set_aspect('equal', adjustable='box')
@@ -1,11 +1,19 @@
 
 from PySide6.QtWidgets import QMainWindow, QApplication, QMessageBox
-from PySide6.QtGui import QPixmap, QImage
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QPixmap, QImage, QPixmapCache, QImageReader
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+from matplotlib.colors import Normalize
 import pandas as pd
 import sys
 import os
+import json
+import functools
+import threading
 import openpyxl
 import math
 from openpyxl import Workbook
@@ -13,183 +21,331 @@ from PIL import Image as PILImage
 from io import BytesIO
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.drawing.image import Image as ExcelImage
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Font, Border, Side
+from truss_resources import ensure_resources
+
+# ui_Test1이 Truss_rc를 import 하기 전에 바이너리 리소스를 등록 (파이썬 리소스 모듈을 읽지 않음)
+ensure_resources("Truss")
+
 from ui_Test1 import Ui_MainWindow
 from ui_Test2 import Ui_MainWindow2
 from ui_Test3 import Ui_MainWindow3
 from ui_Test4 import Ui_MainWindow4
-
-# Define global variables for material properties and constants
-E = 210e9  # Young's modulus (Pa)
-A = 0.01  # Cross-sectional area (m^2)
-density = 7850  # kg/m^3
-gravity = 9.81  # m/s^2
-material_elasticity_kg_per_mm2 = 345e6  # 항복응력 (N/m^2), 강재의 일반적인 값
+from truss_results import save_results
+from truss_solver import calculate_weight, element_properties_batch, Solver
+
+PIXMAP_CACHE_LIMIT_KB = 64 * 1024  # 창 이미지 캐시 한도 (초과 시 오래된 이미지부터 제거)
+
+# 다음 창에서 사용할 이미지 (현재 창이 떠 있는 동안 미리 디코딩)
+MAIN_WINDOW2_IMAGES = ('truss11.jpg', 'truss2.jpg', 'truss3.jpg', 'truss1.png', 'DT2.jpg', 'DT.png')
+MAIN_WINDOW3_IMAGES = ('DT3.jpg',)
+
+# 작업 스레드가 디코딩한 QImage (경로 -> QImage), UI 스레드에서 QPixmap으로 변환하며 꺼내 쓴다
+_prefetched_images = {}
+# 더 이상 미리 디코딩 결과를 보관할 필요가 없는 경로 (UI 스레드에서 직접 디코딩했거나 창 생성 후 정리됨)
+_settled_paths = set()
+_prefetch_lock = threading.Lock()
+
+RESOURCES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
+DISPLAY_DIR = os.path.join(RESOURCES_DIR, 'display')  # build_assets.py가 만든 표시 크기 변형본
+
+def image_path(image_file):
+    return os.path.join(RESOURCES_DIR, image_file)
+
+# 표시용 변형본 목록 (이미지 파일 -> {"WxH": [파일, ...]}), 없으면 빈 dict
+@functools.lru_cache(maxsize=None)
+def _display_manifest():
+    try:
+        with open(os.path.join(DISPLAY_DIR, 'manifest.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+@functools.lru_cache(maxsize=None)
+def _supported_formats():
+    return {bytes(fmt).decode() for fmt in QImageReader.supportedImageFormats()}
+
+# 변형본 중 Qt가 읽을 수 있는 첫 번째 파일 경로
+def _readable_variant(files):
+    for name in files:
+        if os.path.splitext(name)[1][1:].lower() in _supported_formats():
+            return os.path.join(DISPLAY_DIR, name)
+    return None
+
+# 라벨 크기에 맞는 변형본 경로, 없으면 원본 경로
+def display_image_path(image_file, width, height):
+    files = _display_manifest().get(image_file, {}).get(f"{width}x{height}", [])
+    return _readable_variant(files) or image_path(image_file)
+
+# 이미지의 모든 표시 크기 변형본 경로 (미리 디코딩용), 없으면 원본 경로
+def display_image_paths(image_file):
+    variants = _display_manifest().get(image_file, {}).values()
+    paths = [path for path in map(_readable_variant, variants) if path]
+    return paths or [image_path(image_file)]
+
+# 디코딩한 이미지를 프로세스 전체에서 공유 (창을 다시 만들어도 디스크에서 다시 읽지 않음)
+def cached_pixmap(path):
+    if QPixmapCache.cacheLimit() < PIXMAP_CACHE_LIMIT_KB:
+        QPixmapCache.setCacheLimit(PIXMAP_CACHE_LIMIT_KB)
+
+    pixmap = QPixmapCache.find(path)
+    if pixmap is None:
+        with _prefetch_lock:
+            image = _prefetched_images.pop(path, None)
+            _settled_paths.add(path)
+        # 미리 디코딩된 이미지가 있으면 변환만 하고, 아직 없으면 직접 디코딩
+        pixmap = QPixmap.fromImage(image) if image is not None else QPixmap(path)
+        QPixmapCache.insert(path, pixmap)
+    return pixmap
+
+# 이미지 디코딩 작업 (QThreadPool 작업 스레드에서 실행)
+class ImageDecodeTask(QRunnable):
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = paths
+
+    def run(self):
+        for path in self.paths:
+            image = QImage(path)
+            if not image.isNull():
+                with _prefetch_lock:
+                    # 작업이 끝나기 전에 UI 스레드가 이미 읽었거나 정리한 경로는 보관하지 않는다
+                    if path not in _settled_paths:
+                        _prefetched_images[path] = image
+
+# 다음 창의 이미지를 작업 스레드에서 미리 디코딩 (이미 캐시에 있는 이미지는 제외)
+def prefetch_images(image_files):
+    paths = [path for image_file in image_files for path in display_image_paths(image_file)]
+    with _prefetch_lock:
+        paths = [path for path in paths if path not in _prefetched_images and QPixmapCache.find(path) is None]
+        _settled_paths.difference_update(paths)
+    if paths:
+        QThreadPool.globalInstance().start(ImageDecodeTask(paths))
+
+# 창을 다 만든 뒤 호출: 쓰이지 않은 변형본 등 남은 미리 디코딩 결과를 버린다
+def release_prefetched_images(image_files):
+    paths = [path for image_file in image_files for path in display_image_paths(image_file)]
+    with _prefetch_lock:
+        for path in paths:
+            _prefetched_images.pop(path, None)
+        _settled_paths.update(paths)
 
 def load_image(image_file, label):
-    resources_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
-    image_path = os.path.join(resources_dir, image_file)
-    pixmap = QPixmap(image_path)
-    label.setPixmap(pixmap)
-
-class BridgeElement:
-    def __init__(self, material_type, bridge_length_m, support_points_count, material_elasticity_kg_per_mm2,
-                 live_load_kN, member_section):
-        self.material_type = material_type  # 재료 종류
-        self.bridge_length_m = bridge_length_m  # 교량 길이 (m)
-        self.support_points_count = support_points_count  # 절점 갯수 (개)
-        self.material_elasticity_kg_per_mm2 = material_elasticity_kg_per_mm2  # 재료 탄성 계수 (kg/mm^2)
-        self.live_load_kN = live_load_kN  # 활 하중 (kN)
-        self.member_section = member_section  # 부재 단면
-
-    def set_fixed_load(self, fixed_load_kN):
-        self.fixed_load_kN = fixed_load_kN
-
-    def set_unit_weight(self, unit_weight_kg):
-        self.unit_weight_kg = unit_weight_kg
-
-def calculate_weight(member_section, bridge_length_m, N):
-    # 자중 계산 함수
-    unit_weight_kg = density * gravity
-    bottom_members_count = N // 2
-    volume = member_section * bridge_length_m / bottom_members_count
-    weight = volume * unit_weight_kg
-    fixed_load_kN = weight / bridge_length_m
-
-    return weight, fixed_load_kN
-
-def calculate_section_modulus(member_section):
-    width = (member_section ** 0.5) / 2  # 가정: 플랜지와 웹의 비율에 따른 폭
-    height = member_section / width  # 단면적에 따른 높이
-    S = (width * height ** 2) / 6  # 대략적인 단면적 모멘트 계산
-
-    return S
-
-def calculate_flexural_strength(member_section, bridge_length_m, live_load_kN, fixed_load_kN):
-    D = fixed_load_kN * bridge_length_m ** 2 / 8
-    L = live_load_kN * bridge_length_m / 4
-    Mu = 1.2 * D + 1.6 * L
-    return Mu, D, L
-
-def evaluate_safety(Mu, Mn):
-    return "안전" if Mu <= Mn else "불안전"
-
-
-# 트러스 구조 생성 함수 수정
-def create_truss_structure(n):
-    nodes = []
-    elements = []
-
-    # 노드 생성
-    for i in range(n):
-        nodes.append([i, 0])
-        nodes.append([i, 1])
-
-    # 요소 생성
-    for i in range(n):
-        if i < n - 1:
-            elements.append([2 * i, 2 * (i + 1)])      # 아래 가로선
-            elements.append([2 * i + 1, 2 * (i + 1) + 1])  # 위 가로선
-            elements.append([2 * i, 2 * (i + 1) + 1])  # 대각선 (아래에서 위로)
-            elements.append([2 * i + 1, 2 * (i + 1)])  # 대각선 (위에서 아래로)
-
-    # 세로선
-    for i in range(n):
-        elements.append([2 * i, 2 * i + 1])
-
-    nodes = np.array(nodes)
-    elements = np.array(elements)
-    return nodes, elements
-
-# 요소의 길이와 각도 계산
-def element_properties(node1, node2):
-    length = np.linalg.norm(node2 - node1)
-    angle = np.arctan2(node2[1] - node1[1], node2[0] - node1[0])
-    return length, angle
-
-# 요소 강성 행렬 계산
-def element_stiffness_matrix(length, angle):
-    c = np.cos(angle)
-    s = np.sin(angle)
-    k = (E * A / length) * np.array([
-        [c * c, c * s, -c * c, -c * s],
-        [c * s, s * s, -c * s, -s * s],
-        [-c * c, -c * s, c * c, c * s],
-        [-c * s, -s * s, c * s, s * s]
-    ])
-    return k
-
-# 전체 강성 행렬 조립
-def assemble_global_stiffness(nodes, elements):
-    n_nodes = nodes.shape[0]
-    n_dof = 2 * n_nodes
-    K = np.zeros((n_dof, n_dof))
-
-    for element in elements:
-        if element[0] < n_nodes and element[1] < n_nodes:
-            node1 = nodes[element[0]]
-            node2 = nodes[element[1]]
-            length, angle = element_properties(node1, node2)
-            k = element_stiffness_matrix(length, angle)
-
-            dof_indices = np.array([
-                2 * element[0], 2 * element[0] + 1,
-                2 * element[1], 2 * element[1] + 1
-            ])
-
-            for i in range(4):
-                for j in range(4):
-                    K[dof_indices[i], dof_indices[j]] += k[i, j]
-        else:
-            print(f"Invalid element: {element}")
+    label.setPixmap(cached_pixmap(display_image_path(image_file, label.width(), label.height())))
 
-    return K
+class SolverSignals(QObject):
+    finished = Signal(object)  # SolverResult
+    failed = Signal(str)
 
-# 응력 계산
-def element_stress(node1, node2, u1, u2, length, angle):
-    c = np.cos(angle)
-    s = np.sin(angle)
-    T = np.array([-c, -s, c, s])
-    strain = (1 / length) * T @ np.concatenate((u1, u2))
-    stress = E * strain
-    return stress
-
-
-# 시각화 함수
-def plot_truss(nodes, elements):
-    plt.figure(figsize=(8.2, 5))
-
-    for idx, element in enumerate(elements):
-        node1 = nodes[element[0]]
-        node2 = nodes[element[1]]
-        x_values = [node1[0], node2[0]]
-        y_values = [node1[1], node2[1]]
-        plt.plot(x_values, y_values, 'b-o')
-
-        # Display element number slightly off-center
-        offset_x = (node2[0] - node1[0]) * 0.05
-        offset_y = (node2[1] - node1[1]) * 0.05
-        plt.text(np.mean(x_values) + offset_x, np.mean(y_values) + offset_y, f'{idx + 1}', color='red')
-
-    # Display hinges
-    hinge_nodes = [0, -2]  # Indices of the two end nodes
-    hinge_coordinates = nodes[hinge_nodes]
-    plt.plot(hinge_coordinates[:, 0], hinge_coordinates[:, 1], 'r^')  # Display red triangles for hinges
+# 구조 해석 작업 (조립, 분해, 풀이를 작업 스레드에서 실행하고 결과는 시그널로 UI 스레드에 전달)
+class SolverTask(QRunnable):
+    def __init__(self, solver):
+        super().__init__()
+        self.solver = solver
+        self.signals = SolverSignals()
 
-    # Remove axes and labels
-    plt.gca().axes.get_xaxis().set_visible(False)
-    plt.gca().axes.get_yaxis().set_visible(False)
+    def run(self):
+        try:
+            result = self.solver.solve()
+        except Exception as e:
+            self.signals.failed.emit(f"{type(e).__name__}: {e}")
+        else:
+            self.signals.finished.emit(result)
+
+LABEL_MEMBER_LIMIT = 200  # 부재 번호는 부재 수가 이 값보다 적을 때만 표시
+
+# 트러스를 Axes에 그림: 모든 부재를 LineCollection 하나로, 모든 노드를 scatter 하나로 그린다
+# stresses가 주어지면 부재 색을 응력에 따라 표시 (인장: 빨강, 압축: 파랑)
+def draw_truss(ax, nodes, elements, stresses=None, label_limit=LABEL_MEMBER_LIMIT):
+    segments = nodes[elements].astype(float)  # (n_elem, 2, 2)
+    lines = LineCollection(segments, linewidths=1.5)
+    _set_stress_colors(lines, stresses)
+    ax.add_collection(lines)
+
+    points = ax.scatter(nodes[:, 0], nodes[:, 1], s=36, c='b', zorder=3)
+
+    # Display hinges (the two end nodes)
+    hinge_coordinates = nodes[[0, -2]]
+    hinges = ax.scatter(hinge_coordinates[:, 0], hinge_coordinates[:, 1], s=36, c='r', marker='^', zorder=4)
+
+    # Display element number slightly off-center (small models only)
+    labels = []
+    if len(elements) < label_limit:
+        positions = segments.mean(axis=1) + (segments[:, 1] - segments[:, 0]) * 0.05
+        labels = [ax.text(x, y, f'{idx + 1}', color='red') for idx, (x, y) in enumerate(positions)]
+
+    ax.autoscale_view()
+    return lines, points, hinges, labels
+
+def _set_stress_colors(lines, stresses):
+    if stresses is None:
+        lines.set_array(None)
+        lines.set_color('b')
+    else:
+        limit = float(np.abs(stresses).max()) or 1.0
+        lines.set_array(np.asarray(stresses, dtype=float))
+        lines.set_cmap('coolwarm')
+        lines.set_norm(Normalize(-limit, limit))
+
+# draw_truss로 만든 그림 요소를 새 좌표/응력으로 갱신 (부재 수가 같을 때만 가능, 성공 여부 반환)
+def update_truss(ax, artists, nodes, elements, stresses=None):
+    lines, points, hinges, labels = artists
+    if len(lines.get_segments()) != len(elements) or len(points.get_offsets()) != len(nodes):
+        return False
+
+    segments = nodes[elements].astype(float)
+    lines.set_segments(segments)
+    _set_stress_colors(lines, stresses)
+    points.set_offsets(nodes)
+    hinges.set_offsets(nodes[[0, -2]])
+    if labels:
+        positions = segments.mean(axis=1) + (segments[:, 1] - segments[:, 0]) * 0.05
+        for text, position in zip(labels, positions):
+            text.set_position(position)
+
+    ax.dataLim.update_from_data_xy(nodes, ignore=True)
+    ax.autoscale_view()
+    return True
+
+# 그림을 메모리에서 래스터화: (H, W, 4) RGBA 배열 (Agg 버퍼를 복사 없이 참조)
+def render_figure_rgba(fig):
+    canvas = FigureCanvasAgg(fig) if not isinstance(fig.canvas, FigureCanvasAgg) else fig.canvas
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba())
+
+# RGBA 배열을 PNG 바이트로 인코딩 (엑셀 보고서 이미지용)
+def rgba_to_png(rgba):
+    buffer = BytesIO()
+    PILImage.fromarray(rgba).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+RESULT_ARRAY_FILE = '트러스_구조_해석_결과.npz'  # 엑셀 보고서와 함께 저장하는 배열 결과 (truss_results.load_results로 읽기)
+EXCEL_STREAMING_MIN_MEMBERS = 2000  # 부재 수가 이 값 이상이면 write-only 모드로 보고서 작성
+EXPORT_PROGRESS_ROWS = 1000  # 진행률 보고 및 취소 확인 간격 (행)
+
+class ExportCancelled(Exception):
+    pass
+
+# 보고서 작성 진행률 보고와 취소 확인 (표의 행 단위)
+class ExportProgress:
+    def __init__(self, total_rows, progress=None, is_cancelled=None):
+        self.total_rows = max(total_rows, 1)
+        self.progress = progress
+        self.is_cancelled = is_cancelled
+        self.rows = 0
+
+    def step(self):
+        self.rows += 1
+        if self.rows % EXPORT_PROGRESS_ROWS == 0:
+            self.check()
+
+    def check(self):
+        if self.is_cancelled is not None and self.is_cancelled():
+            raise ExportCancelled()
+        if self.progress is not None:
+            # 파일 저장 단계가 남아 있으므로 표 작성은 95%까지만 보고
+            self.progress(95 * self.rows // self.total_rows)
+
+# write-only 통합 문서에 보고서를 한 행씩 기록 (부재 수와 관계없이 메모리 사용량 일정)
+def write_report_streaming(file_path, result_data, solver_lines, nodes, elements, stresses, image_png=None,
+                           progress=None, is_cancelled=None):
+    tracker = ExportProgress(len(stresses) + len(elements) + len(nodes), progress, is_cancelled)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("트러스 구조 설계 결과")
+
+    try:
+        title_cell = WriteOnlyCell(ws, value='트러스 구조 설계 결과')
+        title_cell.font = Font(size=25, bold=True)
+        title_cell.alignment = Alignment(horizontal='center')
+        ws.append([title_cell])
+        ws.append([])
+        ws.append([])
+
+        date_cell = WriteOnlyCell(ws, value='2024-06-16')
+        date_cell.alignment = Alignment(horizontal='right')
+        ws.append(['날짜', date_cell])
+
+        if image_png is not None:
+            img = ExcelImage(BytesIO(image_png))
+            img.anchor = 'A6'
+            ws.add_image(img)
+        for _ in range(5, 30):
+            ws.append([])
+
+        for key, value in result_data.items():
+            ws.append([key, str(value)])
+        ws.append([])
+
+        ws.append(["솔버 결과"])
+        for line in solver_lines:
+            ws.append([line.strip()])
+        ws.append([])
+        ws.append([])
+
+        # 부재별 응력과 길이 데이터
+        ws.append(["부재별 응력과 길이"])
+        ws.append(["부재번호", "응력 (MPa)", "길이 (m)"])
+        lengths, _, _ = element_properties_batch(nodes, elements)
+        for idx, (stress, length) in enumerate(zip(np.asarray(stresses).tolist(), lengths.tolist()), start=1):
+            ws.append([idx, stress, length])
+            tracker.step()
+        ws.append([])
+
+        # 요소 데이터
+        ws.append(["요소 데이터"])
+        ws.append([None, "노드1", "노드2"])
+        for node1, node2 in np.asarray(elements).tolist():
+            ws.append([None, node1, node2])
+            tracker.step()
+        ws.append([])
+
+        # 노드 데이터
+        ws.append(["노드 데이터"])
+        ws.append(["X 좌표", "Y 좌표"])
+        for x, y in np.asarray(nodes).tolist():
+            ws.append([x, y])
+            tracker.step()
+
+        tracker.check()
+    except ExportCancelled:
+        # 임시 파일에 쓰던 시트를 닫고 저장하지 않는다
+        ws.close()
+        raise
+
+    wb.save(file_path)
+    return file_path
+
+class ReportExportSignals(QObject):
+    progress = Signal(int)  # 진행률 (%)
+    finished = Signal(str)  # 저장된 파일 경로
+    failed = Signal(str)
+    cancelled = Signal()
+
+# 보고서 저장 작업 (QThreadPool 작업 스레드에서 실행, UI 스레드는 계속 응답)
+class ReportExportTask(QRunnable):
+    def __init__(self, write):
+        super().__init__()
+        self.write = write  # write(progress, is_cancelled) -> 파일 경로
+        self.signals = ReportExportSignals()
+        self._cancel_event = threading.Event()
 
-    # Remove grid
-    plt.grid(False)
+    def cancel(self):
+        self._cancel_event.set()
 
-    plt.title('Truss Structure')
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
 
-    # Save image to temporary file
-    temp_file = 'truss_structure.png'
-    plt.savefig(temp_file)
-    plt.close()
-    return temp_file
+    def run(self):
+        try:
+            file_path = self.write(self.signals.progress.emit, self.is_cancelled)
+        except ExportCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.progress.emit(100)
+            self.signals.finished.emit(file_path)
 
 #########################################################################
 
@@ -203,6 +359,7 @@ class MainWindow(QMainWindow):
         load_image('6313503-200.png', self.ui.label_24)
         load_image('5469180-200.png', self.ui.label_25)
         load_image('2018888-200.png', self.ui.label_26)
+        prefetch_images(MAIN_WINDOW2_IMAGES)
 
         self.ui.pushButton.clicked.connect(self.on_pushButton_clicked)
 
@@ -224,6 +381,8 @@ class MainWindow2(QMainWindow):
         load_image('truss1.png', self.ui2.label_23)
         load_image('DT2.jpg', self.ui2.label_21)
         load_image('DT.png', self.ui2.label_20)
+        release_prefetched_images(MAIN_WINDOW2_IMAGES)
+        prefetch_images(MAIN_WINDOW3_IMAGES)
 
         self.ui2.pushButton.clicked.connect(self.on_pushButton_clicked)
 
@@ -240,6 +399,7 @@ class MainWindow3(QMainWindow):
         self.ui3.setupUi(self)
 
         load_image('DT3.jpg', self.ui3.label_22)
+        release_prefetched_images(MAIN_WINDOW3_IMAGES)
 
         self.ui3.pushButton.clicked.connect(self.on_pushButton_clicked)
 
@@ -268,99 +428,6 @@ class MainWindow3(QMainWindow):
 ###############################################################
 
 
-class Solver:
-    def __init__(self, material_type, bridge_length_m, support_points_count, live_load_kN, member_section,
-                 fixed_load_kN):
-        self.material_type = material_type
-        self.bridge_length_m = bridge_length_m
-        self.support_points_count = support_points_count
-        self.live_load_kN = live_load_kN
-        self.member_section = member_section
-        self.fixed_load_kN = fixed_load_kN
-        self.material_elasticity_kg_per_mm2 = material_elasticity_kg_per_mm2
-        self.ui4 = Ui_MainWindow4()
-
-    def solve(self):
-        try:
-            # Create BridgeElement instance
-            bridge = BridgeElement(self.material_type, self.bridge_length_m, self.support_points_count,
-                                   material_elasticity_kg_per_mm2, self.live_load_kN, self.member_section)
-
-            # Set fixed load and unit weight using calculate_weight function
-            self_weight, fixed_load_kN = calculate_weight(self.member_section, self.bridge_length_m,
-                                                          self.support_points_count)
-            bridge.set_fixed_load(fixed_load_kN)
-            bridge.set_unit_weight(self_weight)
-
-            # Calculate Mu, D, L
-            Mu, D, L = calculate_flexural_strength(bridge.member_section, bridge.bridge_length_m, bridge.live_load_kN,
-                                                   bridge.fixed_load_kN)
-
-            # Calculate section modulus
-            S = calculate_section_modulus(bridge.member_section)
-
-            # Calculate Mn
-            Mn = material_elasticity_kg_per_mm2 * S
-
-            # Evaluate safety
-            safety_status = evaluate_safety(Mu, Mn)
-
-            # Truss structure creation and visualization
-            n = self.support_points_count // 2
-            nodes, elements = create_truss_structure(n)
-
-            # Global stiffness matrix assembly
-            K = assemble_global_stiffness(nodes, elements)
-
-            # Boundary conditions and external force definition (example: applying force to the last node)
-            fixed_dofs = [0, 1, 2, 3]
-            free_dofs = list(set(range(2 * nodes.shape[0])) - set(fixed_dofs))
-            F = np.zeros(2 * nodes.shape[0])
-            F[4 * (n - 1) + 2] = 1000  # Applying force in the x-direction to the last node
-
-            # Displacement calculation
-            K_ff = K[np.ix_(free_dofs, free_dofs)]
-            F_f = F[free_dofs]
-            U_f = np.linalg.solve(K_ff, F_f)
-
-            # Full displacement vector composition
-            U = np.zeros(2 * nodes.shape[0])
-            U[free_dofs] = U_f
-
-            # Element stress calculation
-            stresses = []
-            for element in elements:
-                node1 = nodes[element[0]]
-                node2 = nodes[element[1]]
-                length, angle = element_properties(node1, node2)
-                dof_indices = np.array([
-                    2 * element[0], 2 * element[0] + 1,
-                    2 * element[1], 2 * element[1] + 1
-                ])
-                u1 = U[dof_indices[:2]]
-                u2 = U[dof_indices[2:]]
-                stress = element_stress(node1, node2, u1, u2, length, angle)
-                stresses.append(stress)
-
-            # Truss structure visualization
-            plot_truss(nodes, elements)
-
-            # Prepare solver result text
-            solver_result = (
-                f"자중으로 인한 등분포하중: {fixed_load_kN:.2f} N/m\n"
-                f"자중에 의한 모멘트: {D:.2f} N*m\n"
-                f"외부하중에 의한 모멘트: {L:.2f} N*m\n"
-                f"계산된 설계휨모멘트 (Mu): {Mu:.2f} N*m\n"
-                f"계산된 단면적 모멘트 (S): {S:.6f} m^3\n"
-                f"계산된 공칭휨강도 (Mn): {Mn:.2f} N*m\n"
-                f"안전성 평가: {safety_status}"
-            )
-
-            return solver_result, safety_status
-
-        except ValueError:
-            return "계산 오류: 잘못된 입력입니다. 숫자를 입력해주세요."
-
 class MainWindow4(QMainWindow):
     def __init__(self, material_type, bridge_length_m, support_points_count, live_load_kN, member_section, fixed_load_kN):
         super().__init__()
@@ -389,189 +456,238 @@ class MainWindow4(QMainWindow):
             f"부재 단면적: {self.member_section} m^2\n"
             f"계산된 고정 하중: {self.fixed_load_kN:.2f} N/m"
         )
+        self.result = None  # SolverResult (해석이 끝나면 설정)
+        self.plot_rgba = None  # 트러스 그림 (RGBA 배열)
+        self.solver_task = None  # 진행 중인 해석 작업
+        self.export_task = None  # 진행 중인 보고서 저장 작업
+        self.init_plot()
         self.ui4.pushButton.clicked.connect(self.save_results_to_excel)
         self.run_solver()
 
+    # 입력값은 바로 표시하고, 해석은 작업 스레드에서 실행 (큰 모델에서도 창이 멈추지 않음)
     def run_solver(self):
-        try:
-            solver = Solver(self.material_type, self.bridge_length_m, self.support_points_count, self.live_load_kN,
-                            self.member_section, self.fixed_load_kN)
-            self.solver_result, self.safety_status = solver.solve()
-
-            self.ui4.label_27.setText(self.solver_result[:1000])
-            self.ui4.label_28.setText(self.safety_status)
-
-            n = self.support_points_count // 2
-            self.nodes, self.elements = create_truss_structure(n)
-
-            K = assemble_global_stiffness(self.nodes, self.elements)
-
-            fixed_dofs = [0, 1, 2, 3]
-            free_dofs = list(set(range(2 * self.nodes.shape[0])) - set(fixed_dofs))
-            F = np.zeros(2 * self.nodes.shape[0])
-            F[4 * (n - 1) + 2] = 1000
-
-            K_ff = K[np.ix_(free_dofs, free_dofs)]
-            F_f = F[free_dofs]
-            U_f = np.linalg.solve(K_ff, F_f)
-
-            U = np.zeros(2 * self.nodes.shape[0])
-            U[free_dofs] = U_f
-
-            self.stresses = []
-            for element in self.elements:
-                node1 = self.nodes[element[0]]
-                node2 = self.nodes[element[1]]
-                length, angle = element_properties(node1, node2)
-                dof_indices = np.array([
-                    2 * element[0], 2 * element[0] + 1,
-                    2 * element[1], 2 * element[1] + 1
-                ])
-                u1 = U[dof_indices[:2]]
-                u2 = U[dof_indices[2:]]
-                stress = element_stress(node1, node2, u1, u2, length, angle)
-                self.stresses.append(stress)
-
-            self.temp_file = self.plot_truss(self.nodes, self.elements, self.bridge_length_m)
+        solver = Solver(self.material_type, self.bridge_length_m, self.support_points_count, self.live_load_kN,
+                        self.member_section, self.fixed_load_kN)
+        task = SolverTask(solver)
+        task.signals.finished.connect(self.on_solver_finished)
+        task.signals.failed.connect(self.on_solver_failed)
+        self.solver_task = task
+
+        self.ui4.label_27.setText("해석 중...")
+        self.ui4.pushButton.setEnabled(False)
+        self.statusBar().showMessage("구조 해석 중...")
+        QThreadPool.globalInstance().start(task)
+
+    def on_solver_failed(self, error):
+        self.solver_task = None
+        message = f"계산 오류: {error}"
+        self.ui4.label_27.setText(message)
+        self.statusBar().showMessage(message)
+        print(message)
+
+    def on_solver_finished(self, result):
+        self.solver_task = None
+        self.result = result
+        self.solver_result, self.safety_status = result.text, result.safety_status
+
+        self.ui4.label_27.setText(self.solver_result[:1000])
+        self.ui4.label_28.setText(self.safety_status)
+
+        # Solver 결과를 그대로 사용 (조립, 풀이, 응력 계산을 반복하지 않음)
+        self.nodes, self.elements = result.nodes, result.elements
+        self.stresses, self.axial_forces = result.stresses, result.axial_forces
+        self.solve_info = result.solve_info
+
+        self.plot_rgba = self.plot_truss(self.nodes, self.elements, self.bridge_length_m, self.stresses)
+        self.ui4.pushButton.setEnabled(True)
+        self.statusBar().clearMessage()
+
+    def init_plot(self):
+        # 창이 살아 있는 동안 재사용하는 Figure/캔버스 (pyplot 전역 상태를 사용하지 않음)
+        self.figure = Figure(figsize=(8.2, 5))
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        self.canvas.setParent(self.ui4.frame)
+        self.canvas.setGeometry(self.ui4.label.x(), self.ui4.label.y(), 820, 500)
+        self.ui4.label.hide()
+
+        self.ax = self.figure.add_subplot(111)
+        self.ax.get_xaxis().set_visible(False)
+        self.ax.get_yaxis().set_visible(False)
+        self.ax.grid(False)
+        self.ax.set_title('Truss Structure')
+        self.truss_artists = None
+
+    def plot_truss(self, nodes, elements, bridge_length, stresses=None):
+        # 부재 구성이 같으면 기존 그림 요소의 좌표와 색만 갱신하고, 다르면 다시 그린다
+        if self.truss_artists is None or not update_truss(self.ax, self.truss_artists, nodes, elements, stresses):
+            for artist in self.ax.collections[:] + self.ax.texts[:]:
+                artist.remove()
+            self.truss_artists = draw_truss(self.ax, nodes, elements, stresses)
+
+        return render_figure_rgba(self.figure)
+
+    def report_data(self):
+        return {
+            "재료 종류": self.material_type,
+            "교량 길이 (m)": self.bridge_length_m,
+            "절점 갯수": self.support_points_count,
+            "활 하중 (kN)": self.live_load_kN,
+            "부재 단면적 (m^2)": self.member_section,
+            "계산된 고정 하중 (N/m)": self.fixed_load_kN,
+            "안전성 평가": self.safety_status,
+        }
+
+    def design_params(self):
+        return {
+            "material_type": self.material_type,
+            "bridge_length_m": self.bridge_length_m,
+            "support_points_count": self.support_points_count,
+            "live_load_kN": self.live_load_kN,
+            "member_section": self.member_section,
+            "fixed_load_kN": self.fixed_load_kN,
+        }
 
-            image = QImage(self.temp_file)
-
-            pixmap = QPixmap.fromImage(image)
-            self.ui4.label.setPixmap(pixmap)
-            self.ui4.label.setFixedSize(pixmap.width(), pixmap.height())
-            self.ui4.label.setScaledContents(True)
-
-        except ValueError:
-            print("계산 오류: 잘못된 입력입니다. 숫자를 입력해주세요.")
-
-    def plot_truss(self, nodes, elements, bridge_length):
-        plt.figure(figsize=(8.2, 5))
-
-        for idx, element in enumerate(elements):
-            node1 = nodes[element[0]]
-            node2 = nodes[element[1]]
-            x_values = [node1[0], node2[0]]
-            y_values = [node1[1], node2[1]]
-            plt.plot(x_values, y_values, 'b-o')
-
-            offset_x = (node2[0] - node1[0]) * 0.05
-            offset_y = (node2[1] - node1[1]) * 0.05
-            plt.text(np.mean(x_values) + offset_x, np.mean(y_values) + offset_y, f'{idx + 1}', color='red')
-
-        hinge_nodes = [0, -2]
-        hinge_coordinates = nodes[hinge_nodes]
-        plt.plot(hinge_coordinates[:, 0], hinge_coordinates[:, 1], 'r^')
+    def save_results_to_excel(self):
+        # 저장 중에 버튼을 다시 누르면 저장 취소
+        if self.export_task is not None:
+            self.export_task.cancel()
+            return
+        # 해석이 끝나기 전에는 저장할 결과가 없음
+        if self.result is None:
+            return
+
+        file_path = '트러스_구조_설계_보고서.xlsx'
+        result_data = self.report_data()
+        solver_lines = self.solver_result.strip().split('\n')
+        nodes, elements, stresses = self.nodes, self.elements, self.stresses
+        # 캔버스 버퍼는 다시 그릴 때 바뀌므로 복사본을 작업 스레드에 넘긴다
+        plot_rgba = self.plot_rgba.copy() if self.plot_rgba is not None else None
+
+        result, params = self.result, self.design_params()
+
+        def write(progress, is_cancelled):
+            image_png = rgba_to_png(plot_rgba) if plot_rgba is not None else None
+            if len(elements) >= EXCEL_STREAMING_MIN_MEMBERS:
+                write_report_streaming(file_path, result_data, solver_lines, nodes, elements, stresses,
+                                       image_png, progress, is_cancelled)
+            else:
+                self.write_report(file_path, result_data, solver_lines, image_png, progress, is_cancelled)
+            save_results(RESULT_ARRAY_FILE, result, params)
+            return file_path
+
+        task = ReportExportTask(write)
+        task.signals.progress.connect(self.on_export_progress)
+        task.signals.finished.connect(self.on_export_finished)
+        task.signals.failed.connect(self.on_export_failed)
+        task.signals.cancelled.connect(self.on_export_cancelled)
+        self.export_task = task
+
+        self.ui4.pushButton.setText("Cancel")
+        self.statusBar().showMessage("엑셀 보고서 저장 중... 0%")
+        QThreadPool.globalInstance().start(task)
+
+    def on_export_progress(self, percent):
+        self.statusBar().showMessage(f"엑셀 보고서 저장 중... {percent}%")
+
+    def on_export_finished(self, file_path):
+        self.end_export(f"엑셀 파일 저장이 완료되었습니다. 파일 경로: {file_path}")
+
+    def on_export_failed(self, error):
+        self.end_export(f"엑셀 파일 저장 중 오류 발생: {error}")
+
+    def on_export_cancelled(self):
+        self.end_export("엑셀 파일 저장이 취소되었습니다.")
+
+    def end_export(self, message):
+        print(message)
+        self.statusBar().showMessage(message, 5000)
+        self.ui4.pushButton.setText("Save to Excel")
+        self.export_task = None
+
+    def write_report(self, file_path, result_data, solver_lines, image_png=None, progress=None, is_cancelled=None):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "트러스 구조 설계 결과"
+
+        title_cell = ws['A1']
+        title_cell.value = '트러스 구조 설계 결과'
+        title_cell.font = Font(size=25, bold=True)
+        title_cell.alignment = Alignment(horizontal='center')
+        ws.merge_cells('A1:I1')
+
+        ws['A4'] = '날짜'
+        ws['B4'] = '2024-06-16'
+        ws['B4'].alignment = Alignment(horizontal='right')
+
+        # 화면에 표시한 트러스 그림을 메모리에서 PNG로 인코딩하여 삽입
+        if image_png is not None:
+            try:
+                img = ExcelImage(BytesIO(image_png))
+                img.anchor = 'A6'
+                ws.add_image(img)
+            except Exception as img_err:
+                print(f"이미지 파일을 불러오는 중 오류 발생: {img_err}")
+
+        current_row = 30
+
+        for key, value in result_data.items():
+            ws[f'A{current_row}'] = key
+            ws.merge_cells(f'B{current_row}:D{current_row}')
+            ws[f'B{current_row}'] = str(value)
+            current_row += 1
 
-        plt.gca().axes.get_xaxis().set_visible(False)
-        plt.gca().axes.get_yaxis().set_visible(False)
-        plt.grid(False)
+        current_row += 1
 
-        plt.title('Truss Structure')
+        ws[f'A{current_row}'] = "솔버 결과"
+        current_row += 1
+        for line in solver_lines:
+            ws[f'A{current_row}'] = line.strip()
+            current_row += 1
 
-        temp_file = 'truss_structure.png'
-        plt.savefig(temp_file)
-        plt.close()
-        return temp_file
+        current_row += 2
 
-    def save_results_to_excel(self):
-        try:
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "트러스 구조 설계 결과"
-
-            title_cell = ws['A1']
-            title_cell.value = '트러스 구조 설계 결과'
-            title_cell.font = Font(size=25, bold=True)
-            title_cell.alignment = Alignment(horizontal='center')
-            ws.merge_cells('A1:I1')
-
-            ws['A4'] = '날짜'
-            ws['B4'] = '2024-06-16'
-            ws['B4'].alignment = Alignment(horizontal='right')
-
-            # 이미지 파일 경로를 명시적으로 지정
-            image_file_path = 'truss_structure.png'
-            if self.temp_file:
-                try:
-                    img = ExcelImage(image_file_path)
-                    img.anchor = 'A6'
-                    ws.add_image(img)
-                except Exception as img_err:
-                    print(f"이미지 파일을 불러오는 중 오류 발생: {img_err}")
-
-            current_row = 30
-
-            result_data = {
-                "재료 종류": self.material_type,
-                "교량 길이 (m)": self.bridge_length_m,
-                "절점 갯수": self.support_points_count,
-                "활 하중 (kN)": self.live_load_kN,
-                "부재 단면적 (m^2)": self.member_section,
-                "계산된 고정 하중 (N/m)": self.fixed_load_kN,
-                "안전성 평가": self.safety_status,
-            }
-
-            for key, value in result_data.items():
-                ws[f'A{current_row}'] = key
-                ws.merge_cells(f'B{current_row}:D{current_row}')
-                ws[f'B{current_row}'] = str(value)
-                current_row += 1
+        # 부재별 응력과 길이 데이터
+        ws[f'A{current_row}'] = "부재별 응력과 길이"
+        current_row += 1
+        ws[f'A{current_row}'] = "부재번호"
+        ws[f'B{current_row}'] = "응력 (MPa)"
+        ws[f'C{current_row}'] = "길이 (m)"
 
+        tracker = ExportProgress(len(self.stresses) + len(self.elements) + len(self.nodes), progress, is_cancelled)
+        # 부재 길이는 스트리밍 보고서와 같은 방식으로 계산 (요소의 절점 번호는 0부터 시작)
+        lengths, _, _ = element_properties_batch(self.nodes, self.elements)
+        for idx, (stress, member_length) in enumerate(zip(self.stresses, lengths.tolist()), start=1):
             current_row += 1
+            ws[f'A{current_row}'] = idx
+            ws[f'B{current_row}'] = stress
+            ws[f'C{current_row}'] = member_length
+            tracker.step()
+
+        current_row += 2
 
-            ws[f'A{current_row}'] = "솔버 결과"
+        # 요소 데이터
+        ws[f'A{current_row}'] = "요소 데이터"
+        elements_df = pd.DataFrame(self.elements, columns=["노드1", "노드2"])
+        for r in dataframe_to_rows(elements_df, index=False, header=True):
             current_row += 1
-            solver_lines = self.solver_result.strip().split('\n')
-            for line in solver_lines:
-                ws[f'A{current_row}'] = line.strip()
-                current_row += 1
+            for col, value in enumerate(r, start=1):
+                ws.cell(row=current_row, column=col + 1, value=value)
+            tracker.step()
 
-            current_row += 2
+        current_row += 2
 
-            # 부재별 응력과 길이 데이터
-            ws[f'A{current_row}'] = "부재별 응력과 길이"
+        # 노드 데이터
+        ws[f'A{current_row}'] = "노드 데이터"
+        nodes_df = pd.DataFrame(self.nodes, columns=["X 좌표", "Y 좌표"])
+        for r in dataframe_to_rows(nodes_df, index=False, header=True):
             current_row += 1
-            ws[f'A{current_row}'] = "부재번호"
-            ws[f'B{current_row}'] = "응력 (MPa)"
-            ws[f'C{current_row}'] = "길이 (m)"
-
-            for idx, (element, stress) in enumerate(zip(self.elements, self.stresses), start=1):
-                node1_coords = self.nodes[element[0] - 1]  # 노드1 좌표
-                node2_coords = self.nodes[element[1] - 1]  # 노드2 좌표
-                length, angle = self.element_properties(node1_coords, node2_coords)
-                member_length = length  # 부재의 길이
-                current_row += 1
-                ws[f'A{current_row}'] = idx
-                ws[f'B{current_row}'] = stress
-                ws[f'C{current_row}'] = member_length
-
-            current_row += 2
-
-            # 요소 데이터
-            ws[f'A{current_row}'] = "요소 데이터"
-            elements_df = pd.DataFrame(self.elements, columns=["노드1", "노드2"])
-            for r in dataframe_to_rows(elements_df, index=False, header=True):
-                current_row += 1
-                for col, value in enumerate(r, start=1):
-                    ws.cell(row=current_row, column=col + 1, value=value)
-
-            current_row += 2
-
-            # 노드 데이터
-            ws[f'A{current_row}'] = "노드 데이터"
-            nodes_df = pd.DataFrame(self.nodes, columns=["X 좌표", "Y 좌표"])
-            for r in dataframe_to_rows(nodes_df, index=False, header=True):
-                current_row += 1
-                for col, value in enumerate(r, start=1):
-                    ws.cell(row=current_row, column=col, value=value)
-
-            file_path = '트러스_구조_설계_보고서.xlsx'
-            wb.save(file_path)
-
-            print(f"엑셀 파일 저장이 완료되었습니다. 파일 경로: {file_path}")
+            for col, value in enumerate(r, start=1):
+                ws.cell(row=current_row, column=col, value=value)
+            tracker.step()
 
-        except Exception as e:
-            print(f"엑셀 파일 저장 중 오류 발생: {e}")
+        tracker.check()
+        wb.save(file_path)
+        return file_path
 
     def element_properties(self, node1, node2):
         """Calculate the length and angle of an element."""
@@ -0,0 +1,150 @@
+"""Qt 창 없이 트러스 설계를 일괄 해석하는 명령행 도구.
+
+사용 예:
+    python truss_batch.py designs.csv -o results.csv
+    python truss_batch.py designs.json -o results.jsonl --method bicgstab
+
+입력 파일(CSV 또는 JSON 목록)의 각 행은 재료 종류, 교량 길이, 절점 갯수, 활 하중, 부재 단면적을 가진다.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+from truss_solver import SOLVER_BACKENDS, calculate_weight, Solver
+
+DESIGN_FIELDS = ("material_type", "bridge_length_m", "support_points_count", "live_load_kN", "member_section")
+RESULT_FIELDS = DESIGN_FIELDS + ("fixed_load_kN", "Mu", "Mn", "safety_status", "max_abs_stress",
+                                 "max_displacement", "factor_time_s", "solve_time_s", "cache_hit", "residual",
+                                 "error")
+# 열 형식(.npz) 결과에서 문자열로 저장하는 열, 나머지는 모두 float64 (빈 값이나 해석할 수 없는 값은 nan)
+TEXT_FIELDS = ("material_type", "safety_status", "error")
+
+
+# 입력 파일에서 설계 목록 읽기 (CSV 헤더 또는 JSON 객체 목록)
+def read_designs(path):
+    if os.path.splitext(path)[1].lower() == ".json":
+        with open(path, encoding="utf-8") as f:
+            designs = json.load(f)
+        if isinstance(designs, dict):
+            designs = designs.get("designs", [designs])
+        return designs
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return list(csv.DictReader(f))
+
+
+# 정수 입력 읽기: JSON의 10.5처럼 소수 부분이 있는 값은 잘라내지 않고 거부 (CSV의 "10.5"와 같은 처리)
+def _parse_int(value, field):
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"{field} must be an integer, got {value!r}")
+    return int(value)
+
+
+# 설계 하나를 해석하여 결과 행(dict) 반환, 입력 오류는 error 열에 기록
+def analyze_design(design, sparse=True, method="direct"):
+    row = {field: design.get(field) for field in DESIGN_FIELDS}
+    try:
+        material_type = design.get("material_type") or "H빔"
+        bridge_length_m = float(design["bridge_length_m"])
+        support_points_count = _parse_int(design["support_points_count"], "support_points_count")
+        live_load_kN = float(design["live_load_kN"])
+        member_section = float(design["member_section"])
+
+        _, fixed_load_kN = calculate_weight(member_section, bridge_length_m, support_points_count)
+        solver = Solver(material_type, bridge_length_m, support_points_count, live_load_kN, member_section,
+                        fixed_load_kN, sparse=sparse, method=method)
+        result = solver.solve()
+
+        row.update({
+            "material_type": material_type,
+            "fixed_load_kN": result.summary["fixed_load_kN"],
+            "Mu": result.summary["Mu"],
+            "Mn": result.summary["Mn"],
+            "safety_status": result.safety_status,
+            "max_abs_stress": float(np.abs(result.stresses).max()),
+            "max_displacement": float(np.abs(result.U).max()),
+            # 분해 캐시에 적중하면 이 설계에서는 분해하지 않았으므로 분해 시간은 0
+            "factor_time_s": 0.0 if result.solve_info["cache_hit"] else result.solve_info["factor_time_s"],
+            "solve_time_s": result.solve_info["time_s"],
+            "cache_hit": result.solve_info["cache_hit"],
+            "residual": result.solve_info["residual"],
+        })
+    except (KeyError, TypeError, ValueError, ZeroDivisionError, np.linalg.LinAlgError) as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+# 결과 행을 열 단위 배열로 모아 NPZ로 저장, 기록한 행 수 반환
+# 열의 dtype은 값과 관계없이 고정 (잘못된 입력 행이 있어도 숫자 열은 float64, 오류 내용은 error 열에 남음)
+def write_results_columns(rows, path):
+    columns = {field: [] for field in RESULT_FIELDS}
+    for row in rows:
+        for field in RESULT_FIELDS:
+            columns[field].append(row.get(field))
+
+    arrays = {}
+    for field, values in columns.items():
+        if field in TEXT_FIELDS:
+            arrays[field] = np.array(["" if value is None else str(value) for value in values], dtype=str)
+        else:
+            arrays[field] = np.array([_to_float(value) for value in values], dtype=np.float64)
+    np.savez(path, **arrays)
+    return len(columns[RESULT_FIELDS[0]])
+
+
+# 결과 행을 CSV, JSON 목록(.json), JSON Lines(.jsonl) 또는 열 형식 NPZ(.npz)로 기록, 기록한 행 수 반환
+def write_results(rows, path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npz":
+        return write_results_columns(rows, path)
+
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if ext == ".jsonl":
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                count += 1
+        elif ext == ".json":
+            f.write("[")
+            for row in rows:
+                f.write(("," if count else "") + "\n" + json.dumps(row, ensure_ascii=False))
+                count += 1
+            f.write("\n]\n")
+        else:
+            writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="트러스 설계 일괄 해석 (GUI 없이 실행)")
+    parser.add_argument("designs", help="설계 입력 파일 (.csv 또는 .json)")
+    parser.add_argument("-o", "--output", default="truss_results.csv",
+                        help="결과 파일 (.csv, .json, .jsonl 또는 .npz, 기본값: truss_results.csv)")
+    parser.add_argument("--method", choices=sorted(SOLVER_BACKENDS), default="direct", help="풀이 백엔드")
+    parser.add_argument("--dense", action="store_true", help="희소 행렬 대신 밀집 행렬로 조립")
+    args = parser.parse_args(argv)
+
+    designs = read_designs(args.designs)
+    rows = (analyze_design(design, sparse=not args.dense, method=args.method) for design in designs)
+    count = write_results(rows, args.output)
+    print(f"{count}개 설계 해석 완료. 결과 파일: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Qt 리소스(.qrc) 지연 등록.
+
+ui 모듈을 import 하기 전에 한 번만 리소스를 등록한다. 컴파일된 바이너리 리소스(<이름>.rcc)가 있으면
+Qt가 파일을 메모리 매핑하여 바로 등록하고, 없으면 기존 파이썬 리소스 모듈(<이름>_rc.py)을 import 한다.
+
+pyside6-uic가 생성한 ui 파일은 `import <이름>_rc`를 포함하므로, .rcc를 등록한 경우 sys.modules에
+빈 <이름>_rc 모듈을 넣어 두어 큰 파이썬 리소스 모듈을 다시 읽고 같은 리소스를 두 번 등록하지 않게 한다.
+
+바이너리 리소스 생성 (resources 폴더에서):
+    pyside6-rcc --binary Truss.qrc -o ../Truss.rcc
+"""
+import importlib
+import os
+import sys
+import types
+
+from PySide6.QtCore import QResource
+
+RESOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_registered = set()
+
+
+def ensure_resources(name):
+    if name in _registered:
+        return
+
+    rcc_path = os.path.join(RESOURCE_DIR, f"{name}.rcc")
+    if os.path.exists(rcc_path) and QResource.registerResource(rcc_path):
+        # 생성된 ui 파일의 `import <이름>_rc`는 이 빈 모듈로 끝난다
+        sys.modules.setdefault(f"{name}_rc", types.ModuleType(f"{name}_rc"))
+    else:
+        try:
+            importlib.import_module(f"{name}_rc")
+        except ImportError as e:
+            # 창들은 load_image로 resources 폴더의 이미지를 다시 불러오므로 경고만 출력
+            print(f"리소스를 불러오지 못했습니다 ({name}): {e}")
+
+    _registered.add(name)
@@ -0,0 +1,84 @@
+"""해석 결과의 열 형식 바이너리 저장 (.npz).
+
+절점, 요소, 변위, 응력, 축력 배열과 입력 매개변수를 압축하지 않은 NPZ 파일 하나에 저장한다.
+배열은 압축 없이 저장하므로 load_results는 zip 안의 .npy 데이터를 바로 메모리 매핑하여,
+여러 해석 결과를 엑셀 파일을 파싱하지 않고 빠르게 불러올 수 있다.
+
+사용 예:
+    save_results("result.npz", result, params)
+    data = load_results("result.npz")
+    data["stresses"].max(), data["params"]["bridge_length_m"]
+"""
+import json
+import zipfile
+
+import numpy as np
+
+RESULT_ARRAYS = ("nodes", "elements", "U", "stresses", "axial_forces")
+FORMAT_VERSION = 1
+
+_LOCAL_HEADER_SIZE = 30  # zip 로컬 파일 헤더의 고정 길이 부분
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# SolverResult와 입력 매개변수(dict)를 NPZ 파일로 저장, 파일 경로 반환
+def save_results(path, result, params=None):
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "params": dict(params or {}),
+        "safety_status": result.safety_status,
+        "summary": result.summary,
+        "solve_info": result.solve_info,
+    }
+    arrays = {name: np.ascontiguousarray(getattr(result, name)) for name in RESULT_ARRAYS}
+    # 메타데이터는 pickle 없이 읽을 수 있도록 JSON 문자열 배열로 저장
+    arrays["meta"] = np.array(json.dumps(meta, ensure_ascii=False, default=_json_default))
+    np.savez(path, **arrays)
+    return path
+
+
+# zip 안에 압축 없이 저장된 .npy 항목을 메모리 매핑
+def _memmap_member(path, archive, info):
+    with open(path, "rb") as f:
+        f.seek(info.header_offset)
+        header = f.read(_LOCAL_HEADER_SIZE)
+        name_len = int.from_bytes(header[26:28], "little")
+        extra_len = int.from_bytes(header[28:30], "little")
+        f.seek(info.header_offset + _LOCAL_HEADER_SIZE + name_len + extra_len)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    if dtype.hasobject or 0 in shape:
+        with archive.open(info) as member:
+            return np.lib.format.read_array(member)
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran_order else "C")
+
+
+# save_results로 저장한 파일 읽기, mmap=True이면 배열을 읽기 전용 메모리 매핑으로 반환
+def load_results(path, mmap=True):
+    data = {}
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            name = info.filename[:-len(".npy")]
+            if name == "meta":
+                with archive.open(info) as member:
+                    data.update(json.loads(np.lib.format.read_array(member).item()))
+            elif mmap and info.compress_type == zipfile.ZIP_STORED:
+                data[name] = _memmap_member(path, archive, info)
+            else:
+                with archive.open(info) as member:
+                    data[name] = np.lib.format.read_array(member)
+    return data
@@ -0,0 +1,104 @@
+"""매개변수 격자에 대한 트러스 설계 병렬 해석 (프로세스 풀 사용).
+
+사용 예:
+    python truss_sweep.py --bridge-length-m 20 30 40 --support-points-count 10 20 \
+        --live-load-kN 100 200 --member-section 0.01 0.02 -o sweep.csv
+    python truss_sweep.py --grid grid.json -o sweep.jsonl --workers 8
+
+grid.json은 {"bridge_length_m": [...], "support_points_count": [...], ...} 형식이다.
+"""
+import argparse
+import itertools
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from truss_batch import DESIGN_FIELDS, analyze_design, write_results
+from truss_solver import SOLVER_BACKENDS
+
+# 절점 갯수를 가장 바깥 반복으로 두어 같은 형상의 설계가 한 묶음에 모이게 한다 (분해 캐시 재사용)
+GRID_ORDER = ("support_points_count", "material_type", "bridge_length_m", "member_section", "live_load_kN")
+
+
+# 매개변수 격자를 설계 목록으로 전개
+def expand_grid(grid):
+    unknown = set(grid) - set(DESIGN_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+
+    grid = dict(grid)
+    grid.setdefault("material_type", ["H빔"])
+    values = [grid[key] if isinstance(grid[key], (list, tuple)) else [grid[key]] for key in GRID_ORDER]
+    return [dict(zip(GRID_ORDER, combo)) for combo in itertools.product(*values)]
+
+
+def _analyze_chunk(designs, sparse, method):
+    return [analyze_design(design, sparse=sparse, method=method) for design in designs]
+
+
+# 설계를 chunksize 단위로 나누어 프로세스 풀에 분배하고, 끝나는 순서대로 결과 행을 내보낸다
+# (인자 검사는 결과 파일을 만들기 전에 바로 하고, 해석은 반환된 제너레이터를 소비할 때 진행)
+def run_sweep(designs, workers=None, chunksize=64, sparse=True, method="direct"):
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1, got {chunksize}")
+    return _sweep_rows(designs, workers, chunksize, sparse, method)
+
+
+def _sweep_rows(designs, workers, chunksize, sparse, method):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_analyze_chunk, designs[i:i + chunksize], sparse, method)
+                   for i in range(0, len(designs), chunksize)}
+        for future in as_completed(futures):
+            # 기록한 묶음의 결과는 바로 놓아 주어 메모리가 전체 설계 수에 비례해 늘지 않게 한다
+            futures.discard(future)
+            rows = future.result()
+            del future
+            yield from rows
+            del rows
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"1 이상의 정수가 필요합니다: {value}")
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="트러스 설계 매개변수 병렬 해석")
+    parser.add_argument("--grid", help="매개변수 격자 JSON 파일")
+    parser.add_argument("--material-type", nargs="+")
+    parser.add_argument("--bridge-length-m", nargs="+", type=float)
+    parser.add_argument("--support-points-count", nargs="+", type=int)
+    parser.add_argument("--live-load-kN", dest="live_load_kN", nargs="+", type=float)
+    parser.add_argument("--member-section", nargs="+", type=float)
+    parser.add_argument("-o", "--output", default="truss_sweep.csv",
+                        help="결과 파일 (.csv, .json, .jsonl 또는 .npz, 기본값: truss_sweep.csv)")
+    parser.add_argument("--workers", type=_positive_int, default=None, help="작업 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--chunksize", type=_positive_int, default=64, help="작업 하나가 해석할 설계 수")
+    parser.add_argument("--method", choices=sorted(SOLVER_BACKENDS), default="direct", help="풀이 백엔드")
+    parser.add_argument("--dense", action="store_true", help="희소 행렬 대신 밀집 행렬로 조립")
+    args = parser.parse_args(argv)
+
+    grid = {}
+    if args.grid:
+        with open(args.grid, encoding="utf-8") as f:
+            grid.update(json.load(f))
+    for field in DESIGN_FIELDS:
+        if getattr(args, field) is not None:
+            grid[field] = getattr(args, field)
+
+    missing = [field for field in DESIGN_FIELDS if field != "material_type" and field not in grid]
+    if missing:
+        parser.error(f"다음 매개변수의 값이 필요합니다: {', '.join(missing)}")
+
+    designs = expand_grid(grid)
+    rows = run_sweep(designs, workers=args.workers, chunksize=args.chunksize, sparse=not args.dense,
+                     method=args.method)
+    count = write_results(rows, args.output)
+    print(f"{count}개 설계 해석 완료. 결과 파일: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())